@@ -10,16 +10,131 @@ This script chains together Snyk API calls to:
 
 Requirements:
 - requests library: pip install requests
+- Optional: orjson (pip install orjson) for faster JSON parsing and export
 - Valid Snyk API token with appropriate permissions
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3 import exceptions as urllib3_exceptions
 import json
 import time
 import csv
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 import os
 import sys
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import chain
+from urllib.parse import urljoin
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("snyk_api_chain")
+
+# Default request budget per API token. Kept below Snyk's published per-token
+# limit so other tools sharing the token still have headroom.
+SNYK_REQUESTS_PER_MINUTE = 1500
+
+# How many times a request is retried after HTTP 429 before giving up
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Fields of a detailed ignore record, in CSV column order. Records travel through
+# the pipeline as tuples in this order and only become dicts for JSON output.
+RECORD_FIELDS = (
+    'org_id', 'org_name', 'project_id', 'project_name', 'issue_id',
+    'reason', 'reasonType', 'created', 'expires',
+    'ignored_by_name', 'ignored_by_email'
+)
+
+
+def parse_json(content: bytes) -> Any:
+    """
+    Parse a JSON response body, using orjson when it is installed.
+    Raises ValueError for a body that isn't JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def read_body(response: requests.Response) -> bytes:
+    """
+    Read and decompress a streamed response body, re-raising urllib3 errors
+    as the requests exceptions response.content would give.
+    """
+    try:
+        return response.raw.read(decode_content=True)
+    except urllib3_exceptions.ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e) from e
+    except urllib3_exceptions.DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e) from e
+    except urllib3_exceptions.ReadTimeoutError as e:
+        # The read timeout also covers stalls while the body is downloading
+        raise requests.exceptions.ReadTimeout(e, response=response) from e
+    except urllib3_exceptions.HTTPError as e:
+        raise requests.exceptions.ConnectionError(e) from e
+
+
+def parse_retry_after(value: str, default: float = 1.0) -> float:
+    """Convert a Retry-After header (delta-seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all worker threads: `burst` requests back to back, then
+    `rate` per second. pause() holds back every thread, e.g. after a 429.
+    """
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._lock = threading.Lock()
+        # Bucket level as of self._updated, which is pushed into the future by pause()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Take a token even if the bucket is empty; the deficit says how long
+            # this caller has to wait for its turn
+            self._tokens -= 1
+            start = self._updated + max(0.0, -self._tokens) / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            resume = now + seconds
+            if resume > self._updated:
+                # Nothing refills while paused, and requests resume one at a time
+                self._tokens = min(self._tokens, 1.0)
+                self._updated = resume
 
 
 class SnykAPIClient:
@@ -29,13 +144,78 @@ class SnykAPIClient:
         self.session = requests.Session()
         self.session.headers.update({
             "Authorization": f"token {api_token}",
-            "Content-Type": "application/vnd.api+json"
+            "Content-Type": "application/vnd.api+json",
+            "Connection": "keep-alive"
         })
+        # Keep enough pooled connections for the ignores workers, the org workers and
+        # their page prefetchers (with headroom for larger worker counts) so keep-alive
+        # sockets are reused instead of re-handshaking TLS on every overflow.
+        # pool_connections counts per-host pools; everything here goes to one host.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=100,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.3,
+                # 429 is handled in _get_json so one throttled response pauses every worker
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=["GET"]
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.rate_limiter = RateLimiter(SNYK_REQUESTS_PER_MINUTE / 60)
+        # (connect, read) seconds, so a stalled socket can't hold a worker forever.
+        # The read timeout applies per socket read, for the headers and the body.
+        self.timeout = (10, 60)
+        # Organization lists keyed by group_id (None for all accessible orgs)
+        self._orgs_cache: Dict[str, List[Dict[str, Any]]] = {}
+        # Number of projects with at least one ignore rule in the last process_all_projects() run
+        self.projects_with_ignores = 0
 
-    def get_organizations(self, group_id: str = None) -> List[Dict[str, Any]]:
+    def _get_json(self, url: str, params: Dict[str, Any] = None) -> Any:
+        """
+        GET a URL and return the parsed JSON body, pausing every worker and
+        retrying (up to MAX_RATE_LIMIT_RETRIES times) when the API answers 429.
+        """
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.wait()
+            with self.session.get(url, params=params, stream=True, timeout=self.timeout) as response:
+                if response.status_code == 429 and attempt < MAX_RATE_LIMIT_RETRIES:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    logger.warning(f"Rate limited by the Snyk API, retrying in {retry_after:.1f}s")
+                    self.rate_limiter.pause(retry_after)
+                    continue
+                response.raise_for_status()
+                return parse_json(read_body(response))
+
+    def _iter_pages(self, url: str, params: Dict[str, Any],
+                    stop: threading.Event = None) -> Iterator[List[Dict[str, Any]]]:
         """
-        Get all organizations using the REST API, handling pagination.
+        Yield the `data` list of each page, following `links.next` and prefetching
+        the next page in the background. No further pages are requested once `stop` is set.
+        """
+        base = self.base_url
+        get_json = self._get_json
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            future = prefetcher.submit(get_json, url, params)
+            while future:
+                data = future.result()
+                next_path = (data.get('links') or {}).get('next')
+                if stop is not None and stop.is_set():
+                    next_path = None
+                # urljoin keeps absolute next links intact instead of prefixing the host twice
+                future = prefetcher.submit(get_json, urljoin(base, next_path)) if next_path else None
+                yield data.get('data', [])
+
+    def iter_organizations(self, group_id: str = None) -> Iterator[Dict[str, Any]]:
         """
+        Yield organizations page by page using the REST API, handling pagination.
+        Completed walks are cached per group_id; call invalidate_orgs() to force a refetch.
+        """
+        if group_id in self._orgs_cache:
+            yield from self._orgs_cache[group_id]
+            return
+
         all_organizations = []
         url = f"{self.base_url}/rest/orgs"
         params = {
@@ -45,27 +225,31 @@ class SnykAPIClient:
         
         if group_id:
             params["group_id"] = group_id
-            print(f"Fetching organizations for group: {group_id}")
+            logger.info(f"Fetching organizations for group: {group_id}")
         
-        while url:
-            try:
-                response = self.session.get(url, params=params if url.endswith("/orgs") else None)
-                response.raise_for_status()
-                
-                data = response.json()
-                all_organizations.extend(data.get('data', []))
-                
-                next_path = data.get('links', {}).get('next')
-                url = f"{self.base_url}{next_path}" if next_path else None
-                    
-            except requests.exceptions.RequestException as e:
-                group_msg = f" for group {group_id}" if group_id else ""
-                print(f"Error fetching organizations{group_msg}: {e}")
-                return []
+        try:
+            for page in self._iter_pages(url, params):
+                all_organizations.extend(page)
+                yield from page
+        except (requests.exceptions.RequestException, ValueError) as e:
+            group_msg = f" for group {group_id}" if group_id else ""
+            logger.error(f"Error fetching organizations{group_msg}: {e}")
+            return
 
         group_msg = f" in group {group_id}" if group_id else ""
-        print(f"Found a total of {len(all_organizations)} organizations{group_msg} after handling pagination.")
-        return all_organizations
+        logger.info(f"Found a total of {len(all_organizations)} organizations{group_msg} after handling pagination.")
+        self._orgs_cache[group_id] = all_organizations
+
+    def get_organizations(self, group_id: str = None) -> List[Dict[str, Any]]:
+        """Get all organizations as a list. See iter_organizations()."""
+        return list(self.iter_organizations(group_id=group_id))
+
+    def invalidate_orgs(self, group_id: str = None):
+        """Drop cached organization lists, for one group or (by default) all of them."""
+        if group_id:
+            self._orgs_cache.pop(group_id, None)
+        else:
+            self._orgs_cache.clear()
 
     def get_groups(self) -> List[Dict[str, Any]]:
         """Get all groups that the user has access to."""
@@ -73,115 +257,202 @@ class SnykAPIClient:
         params = {"version": "2024-10-15"}
         
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(url, params)
             groups = data.get('data', [])
-            print(f"Found {len(groups)} groups")
+            logger.info(f"Found {len(groups)} groups")
             return groups
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching groups: {e}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error fetching groups: {e}")
             return []
 
-    def get_projects_for_org(self, org_id: str) -> List[Dict[str, Any]]:
-        """Get all projects for a specific organization, handling pagination."""
-        all_projects = []
+    def iter_projects_for_org(self, org_id: str, stop: threading.Event = None) -> Iterator[Dict[str, Any]]:
+        """Yield all projects for a specific organization page by page, handling pagination."""
+        project_count = 0
         url = f"{self.base_url}/rest/orgs/{org_id}/projects"
         params = {"version": "2024-10-15", "limit": 100}
         
-        while url:
-            try:
-                response = self.session.get(url, params=params if url.endswith("/projects") else None)
-                response.raise_for_status()
-                data = response.json()
-                all_projects.extend(data.get('data', []))
-                
-                next_path = data.get('links', {}).get('next')
-                url = f"{self.base_url}{next_path}" if next_path else None
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching projects for org {org_id}: {e}")
-                return []
+        try:
+            for page in self._iter_pages(url, params, stop=stop):
+                project_count += len(page)
+                yield from page
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error fetching projects for org {org_id}: {e}")
+            return
+        
+        if stop is not None and stop.is_set():
+            # The walk was cut short, so don't report a partial count
+            return
         
-        print(f"Found a total of {len(all_projects)} projects in org {org_id} after handling pagination.")
-        return all_projects
+        logger.info(f"Found a total of {project_count} projects in org {org_id} after handling pagination.")
+
+    def get_projects_for_org(self, org_id: str, stop: threading.Event = None) -> List[Dict[str, Any]]:
+        """Get all projects for a specific organization as a list. See iter_projects_for_org()."""
+        return list(self.iter_projects_for_org(org_id, stop=stop))
 
     def get_project_ignores(self, org_id: str, project_id: str) -> Dict[str, Any]:
         """Get ignores for a specific project using the v1 API."""
         url = f"{self.base_url}/v1/org/{org_id}/project/{project_id}/ignores"
         
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            print(f"  Successfully retrieved ignores for project {project_id}")
+            data = self._get_json(url)
+            logger.debug(f"Successfully retrieved ignores for project {project_id}")
             return data
-        except requests.exceptions.RequestException as e:
-            print(f"  Error fetching ignores for project {project_id} in org {org_id}: {e}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error fetching ignores for project {project_id} in org {org_id}: {e}")
             return {}
 
-    def process_all_projects(self, group_id: str = None, delay: float = 0.1) -> List[Dict[str, Any]]:
-        """
-        Process all orgs and projects to get a detailed list of every ignore rule.
-        """
-        results = []
-        organizations = self.get_organizations(group_id=group_id)
+    def _iter_org_projects(self, projects_future, org_id: str, org_name: str) -> Iterator[Tuple[str, str, str, str]]:
+        """Yield the leading (org_id, org_name, project_id, project_name) columns for one org."""
+        logger.info(f"Processing organization: {org_name} ({org_id})")
         
-        if not organizations:
-            print("No organizations found or error occurred")
-            return []
+        try:
+            projects = projects_future.result()
+        except Exception as e:
+            logger.error(f"Error fetching projects for org {org_id}: {e}")
+            return
         
-        for org in organizations:
+        for project in projects:
+            project_id = project.get('id')
+            project_name = (project.get('attributes') or {}).get('name', 'Unknown')
+            
+            if not project_id:
+                logger.warning(f"Skipping project with missing ID: {project}")
+                continue
+            
+            logger.debug(f"Processing project: {project_name} ({project_id})")
+            yield (org_id, org_name, project_id, project_name)
+
+    def _iter_project_columns(self, group_id: str, org_executor: ThreadPoolExecutor, org_workers: int,
+                              stop: threading.Event) -> Iterator[Tuple[str, str, str, str]]:
+        """
+        Yield the leading columns of every project, in org order, paginating up to
+        `org_workers` orgs' project lists ahead of the one being yielded.
+        """
+        org_pending = deque()
+        org_count = 0
+        for org in self.iter_organizations(group_id=group_id):
+            org_count += 1
             org_id = org.get('id')
-            org_name = org.get('attributes', {}).get('name', 'Unknown')
+            org_name = (org.get('attributes') or {}).get('name', 'Unknown')
             
             if not org_id:
-                print(f"Skipping organization with missing ID: {org}")
+                logger.warning(f"Skipping organization with missing ID: {org}")
                 continue
             
-            print(f"\nProcessing organization: {org_name} ({org_id})")
-            projects = self.get_projects_for_org(org_id)
-            
-            for project in projects:
-                project_id = project.get('id')
-                project_name = project.get('attributes', {}).get('name', 'Unknown')
-                
-                if not project_id:
-                    print(f"Skipping project with missing ID: {project}")
-                    continue
-                
-                print(f"    Processing project: {project_name} ({project_id})")
-                ignores_data = self.get_project_ignores(org_id, project_id)
-                
-                if not ignores_data:
+            org_pending.append((org_executor.submit(self.get_projects_for_org, org_id, stop), org_id, org_name))
+            if len(org_pending) >= org_workers:
+                yield from self._iter_org_projects(*org_pending.popleft())
+        
+        if not org_count:
+            logger.warning("No organizations found or error occurred")
+            return
+        
+        while org_pending:
+            yield from self._iter_org_projects(*org_pending.popleft())
+
+    def _ignore_rows(self, future, project_columns: Tuple[str, str, str, str]) -> List[Tuple[Any, ...]]:
+        """Wait for one project's ignores and turn them into row tuples (see RECORD_FIELDS)."""
+        try:
+            ignores_data = future.result()
+        except Exception as e:
+            logger.error(f"Error fetching ignores for project {project_columns[2]}: {e}")
+            return []
+        
+        rows = []
+        if not ignores_data:
+            return rows
+        rows_append = rows.append
+
+        # Loop through each ignore rule in the project
+        for issue_id, ignore_list in ignores_data.items():
+            for ignore_item in ignore_list:
+                # The actual details are often under a wildcard key '*'
+                details = ignore_item.get('*')
+                if not details:
                     continue
 
-                # Loop through each ignore rule in the project
-                for issue_id, ignore_list in ignores_data.items():
-                    for ignore_item in ignore_list:
-                        # The actual details are often under a wildcard key '*'
-                        details = ignore_item.get('*', {})
-                        if not details:
-                            continue
-
-                        ignored_by = details.get('ignoredBy', {})
-                        record = {
-                            'org_id': org_id,
-                            'org_name': org_name,
-                            'project_id': project_id,
-                            'project_name': project_name,
-                            'issue_id': issue_id,
-                            'reason': details.get('reason', 'N/A'),
-                            'reasonType': details.get('reasonType', 'N/A'),
-                            'created': details.get('created', 'N/A'),
-                            'expires': details.get('expires', 'Never'),
-                            'ignored_by_name': ignored_by.get('name', 'N/A'),
-                            'ignored_by_email': ignored_by.get('email', 'N/A')
-                        }
-                        results.append(record)
-                
-                time.sleep(delay)
+                ignored_by = details.get('ignoredBy') or {}
+                rows_append(project_columns + (
+                    issue_id,
+                    details.get('reason', 'N/A'),
+                    details.get('reasonType', 'N/A'),
+                    details.get('created', 'N/A'),
+                    details.get('expires', 'Never'),
+                    ignored_by.get('name', 'N/A'),
+                    ignored_by.get('email', 'N/A')
+                ))
+        return rows
+
+    def iter_ignore_batches(self, group_id: str = None, delay: float = 0.0,
+                            max_workers: int = 16, org_workers: int = 8) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Process all orgs and projects, yielding one list of row tuples (see RECORD_FIELDS)
+        per project with ignores, keeping at most `max_workers * 4` ignores fetches in flight.
+        A non-zero `delay` replaces the shared rate limit with one request per `delay` seconds.
+        """
+        self.projects_with_ignores = 0
+        self.rate_limiter = (RateLimiter(1 / delay, burst=1) if delay > 0
+                             else RateLimiter(SNYK_REQUESTS_PER_MINUTE / 60))
+        window = max_workers * 4
         
-        return results
+        # One pool for the whole run: ignores are queued as soon as each project is
+        # known, while the next orgs' project lists are still being paginated
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        org_executor = ThreadPoolExecutor(max_workers=org_workers)
+        # Set on an early exit so in-flight project walks stop after their current page
+        stop = threading.Event()
+        finished = False
+        try:
+            pending = deque()
+            for project_columns in self._iter_project_columns(group_id, org_executor, org_workers, stop):
+                future = executor.submit(self.get_project_ignores, project_columns[0], project_columns[2])
+                pending.append((future, project_columns))
+                if len(pending) < window:
+                    continue
+                
+                # Window full: wait for the oldest project before queueing more
+                rows = self._ignore_rows(*pending.popleft())
+                if rows:
+                    self.projects_with_ignores += 1
+                    yield rows
+            
+            while pending:
+                rows = self._ignore_rows(*pending.popleft())
+                if rows:
+                    self.projects_with_ignores += 1
+                    yield rows
+            
+            finished = True
+        finally:
+            # On an early exit (Ctrl-C, an error, or the caller closing the generator)
+            # drop queued fetches instead of waiting for every one of them to run
+            if not finished:
+                stop.set()
+            executor.shutdown(wait=finished, cancel_futures=not finished)
+            org_executor.shutdown(wait=finished, cancel_futures=not finished)
+
+    def iter_ignore_rows(self, group_id: str = None, delay: float = 0.0,
+                         max_workers: int = 16, org_workers: int = 8) -> Iterator[Tuple[Any, ...]]:
+        """Like iter_ignore_batches(), but yield each row tuple on its own."""
+        return chain.from_iterable(self.iter_ignore_batches(group_id=group_id, delay=delay,
+                                                            max_workers=max_workers,
+                                                            org_workers=org_workers))
+
+    def iter_ignore_records(self, group_id: str = None, delay: float = 0.0,
+                            max_workers: int = 16, org_workers: int = 8) -> Iterator[Dict[str, Any]]:
+        """Like iter_ignore_rows(), but yield each record as a dict keyed by RECORD_FIELDS."""
+        for row in self.iter_ignore_rows(group_id=group_id, delay=delay,
+                                         max_workers=max_workers, org_workers=org_workers):
+            yield dict(zip(RECORD_FIELDS, row))
+
+    def process_all_projects(self, group_id: str = None, delay: float = 0.0,
+                             max_workers: int = 16, org_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Process all orgs and projects to get a detailed list of every ignore rule.
+        See iter_ignore_batches() for the concurrency and rate limiting options.
+        """
+        return list(self.iter_ignore_records(group_id=group_id, delay=delay,
+                                             max_workers=max_workers, org_workers=org_workers))
 
     # --- Debug methods remain unchanged ---
     def test_specific_org(self, org_id: str) -> Dict[str, Any]:
@@ -193,39 +464,93 @@ class SnykAPIClient:
         pass
 
 
+class IgnoreRecordWriter:
+    """
+    Stream ignore rows (see RECORD_FIELDS) to a JSON and/or CSV file, created on the
+    first record. A file that fails to write is logged and dropped from `filenames`.
+    """
+    def __init__(self, json_filename: str = None, csv_filename: str = None):
+        self.filenames = {'json': json_filename, 'csv': csv_filename}
+        self.count = 0
+        self._json_file = None
+        self._csv_file = None
+        self._csv_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _fail(self, kind: str, error: Exception):
+        logger.error(f"Error writing {kind.upper()} file {self.filenames[kind]}: {error}")
+        self.filenames[kind] = None
+
+    def write_rows(self, rows: List[Tuple[Any, ...]]):
+        """Write a batch of rows, typically all ignore rules of one project."""
+        if not rows:
+            return
+
+        if self.filenames['json']:
+            try:
+                if self._json_file is None:
+                    self._json_file = open(self.filenames['json'], 'wb')
+                    self._json_file.write(b"[\n  ")
+                else:
+                    self._json_file.write(b",\n  ")
+                dumps = orjson.dumps if orjson is not None else (lambda record: json.dumps(record).encode())
+                self._json_file.write(b",\n  ".join(dumps(dict(zip(RECORD_FIELDS, row))) for row in rows))
+            except Exception as e:
+                self._fail('json', e)
+
+        if self.filenames['csv']:
+            try:
+                if self._csv_writer is None:
+                    self._csv_file = open(self.filenames['csv'], 'w', newline='', encoding='utf-8')
+                    self._csv_writer = csv.writer(self._csv_file)
+                    self._csv_writer.writerow(RECORD_FIELDS)
+                self._csv_writer.writerows(rows)
+            except Exception as e:
+                self._fail('csv', e)
+
+        self.count += len(rows)
+
+    def close(self):
+        if self._json_file is not None:
+            try:
+                if self.filenames['json']:
+                    self._json_file.write(b"\n]\n")
+                self._json_file.close()
+            except Exception as e:
+                self._fail('json', e)
+            self._json_file = None
+
+        if self._csv_file is not None:
+            try:
+                self._csv_file.close()
+            except Exception as e:
+                self._fail('csv', e)
+            self._csv_file = None
+
 def export_to_csv(results: List[Dict[str, Any]], filename: str) -> bool:
     """
     Export detailed ignore results to CSV format.
     """
     if not results:
-        print("No results to export")
+        logger.warning("No results to export")
         return False
     
-    try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            # Define new CSV columns for detailed output
-            fieldnames = [
-                'org_id', 'org_name', 'project_id', 'project_name', 'issue_id',
-                'reason', 'reasonType', 'created', 'expires',
-                'ignored_by_name', 'ignored_by_email'
-            ]
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            # Each item in results is already a flat dictionary for a single row
-            for row in results:
-                writer.writerow(row)
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error exporting to CSV: {e}")
-        return False
+    with IgnoreRecordWriter(csv_filename=filename) as writer:
+        writer.write_rows([tuple(map(record.get, RECORD_FIELDS)) for record in results])
+    return writer.filenames['csv'] is not None
 
 def main():
     """Main function to run the script."""
     
+    # LOGLEVEL=WARNING silences progress output, LOGLEVEL=DEBUG shows every project
+    log_level = os.getenv('LOGLEVEL', 'INFO').upper()
+    logging.basicConfig(level=getattr(logging, log_level, logging.INFO), format="%(message)s", stream=sys.stdout)
+    
     # Get API token from environment variable or prompt user
     api_token = os.getenv('SNYK_TOKEN')
     
@@ -287,6 +612,15 @@ def main():
             else:
                 print("No groups found or error occurred, proceeding without group filter")
     
+    # Export options are chosen up front so records can be written out as
+    # each project is processed instead of being held in memory until the end
+    print("\nExport options:")
+    save_json = input("Save detailed results to JSON file? (y/N): ").strip().lower()
+    save_csv = input("Save detailed results to CSV file? (y/N): ").strip().lower()
+    timestamp = int(time.time())
+    json_filename = f"snyk_ignores_details_{timestamp}.json" if save_json == 'y' else None
+    csv_filename = f"snyk_ignores_details_{timestamp}.csv" if save_csv == 'y' else None
+    
     print("\nThis will:")
     print("1. Fetch all organizations" + (f" in group {group_id}" if group_id else ""))
     print("2. Fetch all projects for each organization")
@@ -294,35 +628,30 @@ def main():
     print()
     
     # Process all projects, passing the selected group_id
-    results = client.process_all_projects(group_id=group_id, delay=0.1)
+    with IgnoreRecordWriter(json_filename=json_filename, csv_filename=csv_filename) as writer:
+        for rows in client.iter_ignore_batches(group_id=group_id):
+            writer.write_rows(rows)
     
     # Updated Summary
     print(f"\n{'='*50}")
     print("SUMMARY")
     print(f"{'='*50}")
     
-    if not results:
+    if not writer.count:
         print("No ignores were found across any projects.")
         return
 
-    print(f"Total ignores found and processed: {len(results)}")
+    print(f"Total ignores found and processed: {writer.count}")
+    print(f"Projects with ignores: {client.projects_with_ignores}")
     
-    # Export options
-    print("\nExport options:")
-    save_json = input("Save detailed results to JSON file? (y/N): ").strip().lower()
-    if save_json == 'y':
-        json_filename = f"snyk_ignores_details_{int(time.time())}.json"
-        try:
-            with open(json_filename, 'w') as f:
-                json.dump(results, f, indent=2)
+    if json_filename:
+        if writer.filenames['json']:
             print(f"JSON results saved to: {json_filename}")
-        except Exception as e:
-            print(f"Error saving JSON file: {e}")
+        else:
+            print("Failed to save JSON file")
     
-    save_csv = input("Save detailed results to CSV file? (y/N): ").strip().lower()
-    if save_csv == 'y':
-        csv_filename = f"snyk_ignores_details_{int(time.time())}.csv"
-        if export_to_csv(results, csv_filename):
+    if csv_filename:
+        if writer.filenames['csv']:
             print(f"CSV results saved to: {csv_filename}")
         else:
             print("Failed to save CSV file")